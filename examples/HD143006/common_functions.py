@@ -36,25 +36,58 @@ def train(
     residuals = connectors.GriddedResidualConnector(model.fcube, dataset)
     residuals.to(device)
 
-    for iteration in range(config["epochs"]):
-
-        optimizer.zero_grad()
+    def evaluate_loss():
         vis = model.forward()
         sky_cube = model.icube.sky_cube
 
-        loss = (
+        return (
             losses.nll_gridded(vis, dataset)
             + config["lambda_sparsity"] * losses.sparsity(sky_cube)
             + config["lambda_TV"] * losses.TV_image(sky_cube)
             + config["entropy"] * losses.entropy(sky_cube, config["prior_intensity"])
         )
 
-        if (iteration % logevery == 0) and writer is not None:
-            writer.add_scalar("loss", loss.item(), iteration)
-            writer.add_figure("image", log_figure(model, residuals), iteration)
-
-        loss.backward()
-        optimizer.step()
+    # JIT-compile the hot loop body if this version of torch supports it
+    # (>= 2.0). Compiling evaluate_loss captures the model forward and the
+    # loss-term reductions, amortizing the per-iteration Python dispatch.
+    # The gridded NLL indexes the visibilities with masked_select, whose
+    # data-dependent output shape dynamo cannot capture in a full graph,
+    # so let it graph-break around the indexing. backward and the
+    # optimizer step stay outside the compiled region.
+    if config.get("compile", False) and hasattr(torch, "compile"):
+        evaluate_loss = torch.compile(evaluate_loss, dynamic=False)
+
+    if isinstance(optimizer, torch.optim.LBFGS):
+        # quasi-Newton path: LBFGS re-evaluates the closure (forward +
+        # backward) several times per step, but each step makes far more
+        # progress on this mostly-convex objective than a first-order
+        # update, so config["epochs"] can be ~10x smaller than for Adam
+
+        def closure():
+            optimizer.zero_grad()
+            loss = evaluate_loss()
+            loss.backward()
+            return loss
+
+        for iteration in range(config["epochs"]):
+            loss = optimizer.step(closure)
+
+            if (iteration % logevery == 0) and writer is not None:
+                writer.add_scalar("loss", loss.item(), iteration)
+                writer.add_figure("image", log_figure(model, residuals), iteration)
+
+    else:
+        for iteration in range(config["epochs"]):
+
+            optimizer.zero_grad()
+            loss = evaluate_loss()
+
+            if (iteration % logevery == 0) and writer is not None:
+                writer.add_scalar("loss", loss.item(), iteration)
+                writer.add_figure("image", log_figure(model, residuals), iteration)
+
+            loss.backward()
+            optimizer.step()
 
     if report:
         tune.report(loss=loss.item())
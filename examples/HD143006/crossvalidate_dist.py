@@ -0,0 +1,70 @@
+import os
+
+import torch
+import torch.distributed as dist
+from common_data import k_fold_datasets, model
+from common_functions import train, test
+
+# Run the k folds in parallel, one process per GPU (NCCL) or one process
+# per group of CPU cores (gloo), launched with e.g.
+#
+#   torchrun --nproc_per_node=5 crossvalidate_dist.py
+#
+# The folds share no gradients, so no DistributedDataParallel wrapper or
+# gradient synchronization is needed — each rank trains its share of the
+# folds (assigned round-robin) and only the final test scores are reduced.
+
+# update to your current directory
+MODEL_PATH = "/gpfs/group/ipc5094/default/RML/data/DSHARP/HD143006/rml/model.pt"
+
+config = {
+    "lr": 0.3,
+    "lambda_sparsity": 7.076022085822013e-05,
+    "lambda_TV": 0.00,
+    "entropy": 1e-03,
+    "prior_intensity": 1.597766235483388e-07,
+    "epochs": 1000,
+}
+
+dist.init_process_group("nccl" if torch.cuda.is_available() else "gloo")
+rank = dist.get_rank()
+world_size = dist.get_world_size()
+
+if torch.cuda.is_available():
+    device = "cuda:{:}".format(rank % torch.cuda.device_count())
+else:
+    device = "cpu"
+    # partition the cores between ranks: the FFT scales sublinearly past a
+    # few threads, so world_size single-fold processes with a share of the
+    # cores each beat one process using all of them. This also overrides
+    # the OMP_NUM_THREADS=1 default that torchrun sets.
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+
+test_scores = []
+for k_fold, (train_dset, test_dset) in enumerate(k_fold_datasets):
+
+    # round-robin assignment of folds to ranks
+    if k_fold % world_size != rank:
+        continue
+
+    # reset model
+    model.load_state_dict(torch.load(MODEL_PATH, map_location="cpu"))
+
+    # create a new optimizer for this k_fold
+    optimizer = torch.optim.Adam(model.parameters(), lr=config["lr"])
+
+    # train for a while
+    train(model, train_dset, optimizer, config, device)
+    # evaluate the test metric
+    test_scores.append(test(model, test_dset, device))
+
+# aggregate all test scores across ranks and sum to evaluate cross val metric
+# pin the dtype: a rank with no assigned folds (world_size > k) would
+# otherwise contribute an int64 zero and break the reduction
+test_score = torch.tensor(sum(test_scores), dtype=torch.float64, device=device)
+dist.all_reduce(test_score, op=dist.ReduceOp.SUM)
+
+if rank == 0:
+    print("Cross validation score: ", test_score.item())
+
+dist.destroy_process_group()
@@ -1,7 +1,7 @@
 import torch
 import matplotlib.pyplot as plt
 import numpy as np
-from torch.utils.tensorboard import SummaryWriter
+from mpol import utils
 from common_data import gridder, model
 
 
@@ -10,10 +10,6 @@ img, beam = gridder.get_dirty_image(weighting="briggs", robust=0.0, unit="Jy/arc
 # make img a tensor
 dirty_image = torch.tensor(img.copy())
 
-# predict the model that produces the dirty image
-# create an optimizer
-optimizer = torch.optim.Adam(model.parameters(), lr=0.5)
-
 # query to see if we have a GPU
 if torch.cuda.is_available():
     device = "cuda"
@@ -21,24 +17,21 @@ else:
     device = "cpu"
 
 model = model.to(device)
-model.train()
 dirty_image = dirty_image.to(device)
-writer = SummaryWriter()
-
-loss_fn = torch.nn.MSELoss()
-
-for iteration in range(500):
-
-    optimizer.zero_grad()
-
-    model.forward()
-    sky_cube = model.icube.sky_cube
-
-    loss = loss_fn(sky_cube, dirty_image)
-    writer.add_scalar("loss", loss.item(), iteration)
 
-    loss.backward()
-    optimizer.step()
+# predict the model that produces the dirty image. Matching the dirty image
+# with an MSE loss involves no data terms, so instead of iterating an
+# optimizer we can initialize the model in closed form: clamp the dirty image
+# to positive values and invert the softplus pixel mapping directly into the
+# base cube parameterization. (The Hann smoothing layer is very nearly the
+# identity for a beam-convolved dirty image, so we ignore it here.)
+with torch.no_grad():
+    packed_cube = utils.sky_cube_to_packed_cube(torch.clamp(dirty_image, min=1e-8))
+    # inverse of softplus: b = log(exp(I) - 1)
+    model.bcube.base_cube.copy_(torch.log(torch.expm1(packed_cube)))
+
+# run forward once to populate the image cube for plotting
+model.forward()
 
 # save the model
 torch.save(model.state_dict(), "model.pt")
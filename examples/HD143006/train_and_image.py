@@ -23,6 +23,14 @@ model.load_state_dict(torch.load("model.pt"))
 # create an optimizer
 optimizer = torch.optim.Adam(model.parameters(), lr=config["lr"])
 
+# alternatively, LBFGS converges in far fewer iterations (~100 steps
+# instead of ~1000), at a few forward/backward evaluations per step:
+# optimizer = torch.optim.LBFGS(
+#     model.parameters(), lr=1.0, max_iter=20, history_size=20,
+#     line_search_fn="strong_wolfe",
+# )
+# config["epochs"] = 100
+
 # writer = SummaryWriter()
 writer = None
 
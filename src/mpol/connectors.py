@@ -1,5 +1,4 @@
 import torch
-import torch.fft  # to avoid conflicts with old torch.fft *function*
 from torch import nn
 
 from . import utils
@@ -54,6 +53,14 @@ class GriddedResidualConnector(nn.Module):
         # take the mask
         self.mask = griddedDataset.mask
 
+        # the prefactor for the residual dirty image (under uniform weighting).
+        # see units_and_conventions.rst for the calculation.
+        # But essentially this calculation requires a prefactor of npix**2 * uv_cell_size**2
+        # Assuming uv_cell_size would be measured in units of cycles/arcsec, then this prefactor is
+        # equivalent to 1/cell_size**2, where cell_size is units of arcsec.
+        # precomputed here so forward() doesn't redo it every iteration
+        self.prefactor = 1 / self.coords.cell_size ** 2
+
     def forward(self):
         r"""Calculate the residuals as
 
@@ -67,19 +74,13 @@ class GriddedResidualConnector(nn.Module):
         """
         self.residuals = self.griddedDataset.vis_gridded - self.fourierCube.vis
 
-        self.amp = torch.abs(self.residuals)
-        self.phase = torch.angle(self.residuals)
+        # amp and phase are lazy property attributes computed from
+        # self.residuals on access, so forward() doesn't keep two extra
+        # full-size cubes alive on every training iteration when they are
+        # only needed for the occasional diagnostic plot
 
-        # calculate the correpsonding residual dirty image (under uniform weighting).
-        # see units_and_conventions.rst for the calculation of the prefactors.
-        # But essentially this calculation requires a prefactor of npix**2 * uv_cell_size**2
-        # Assuming uv_cell_size would be measured in units of cycles/arcsec, then this prefactor is
-        # equivalent to 1/cell_size**2, where cell_size is units of arcsec
-        cube = (
-            1
-            / (self.coords.cell_size ** 2)
-            * torch.fft.ifftn(self.residuals, dim=(1, 2))
-        )  # Jy/arcsec^2
+        # calculate the corresponding residual dirty image (under uniform weighting).
+        cube = self.prefactor * torch.fft.ifft2(self.residuals)  # Jy/arcsec^2
 
         assert (
             torch.max(cube.imag) < 1e-10
@@ -101,6 +102,26 @@ class GriddedResidualConnector(nn.Module):
         """
         return utils.packed_cube_to_sky_cube(self.cube)
 
+    @property
+    def amp(self):
+        r"""
+        The amplitude of the residuals, in packed format.
+
+        Returns:
+            torch.double : 3D amplitude cube of shape ``(nchan, npix, npix)``
+        """
+        return torch.abs(self.residuals)
+
+    @property
+    def phase(self):
+        r"""
+        The phase of the residuals, in packed format.
+
+        Returns:
+            torch.double : 3D phase cube of shape ``(nchan, npix, npix)``
+        """
+        return torch.angle(self.residuals)
+
     @property
     def ground_mask(self):
         r"""
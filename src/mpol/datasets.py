@@ -61,9 +61,12 @@ class GriddedDataset:
 
         Args:
             mask (2D numpy or PyTorch tensor): boolean mask (in packed format) to apply to dataset. Assumes input will be broadcast across all channels. Mask must be Hermitian, like the visibilities themselves.
-            device (torch.device) : the desired device of the dataset. If ``None``, defalts to current device.
+            device (torch.device) : the desired device of the dataset. If ``None``, defaults to the device of the existing dataset tensors.
         """
 
+        if device is None:
+            device = self.mask.device
+
         new_2D_mask = torch.tensor(mask, device=device)
         new_3D_mask = torch.broadcast_to(new_2D_mask, self.mask.size())
 
@@ -271,6 +274,34 @@ class Dartboard:
             # set phi edges
             self.phi_edges = np.linspace(0, np.pi, num=8 + 1)  # [radians]
 
+        # precompute the dartboard cell id of every grid point, so that
+        # build_grid_mask_from_cells is a set-membership test per call rather
+        # than re-evaluating the bin comparisons over the whole grid for every
+        # cell (it is called 2 * k times per cross-validation pass)
+
+        # q bins are half-open [q_min, q_max)
+        q_bin = np.digitize(self.cartesian_qs, self.q_edges) - 1
+
+        # phi bins are (phi_min, phi_max], duplicated on
+        # (phi_min - pi, phi_max - pi] for the Hermitian half,
+        # so map phis <= 0 up by pi first
+        phis = np.where(
+            self.cartesian_phis > 0, self.cartesian_phis, self.cartesian_phis + np.pi
+        )
+        phi_bin = np.digitize(phis, self.phi_edges, right=True) - 1
+
+        # grid points falling outside the bin edges (e.g., the image corners
+        # beyond the outermost q edge) get an id of -1, which never matches a
+        # real cell
+        n_phi = len(self.phi_edges) - 1
+        valid = (
+            (q_bin >= 0)
+            & (q_bin < len(self.q_edges) - 1)
+            & (phi_bin >= 0)
+            & (phi_bin < n_phi)
+        )
+        self.cartesian_cell_ids = np.where(valid, q_bin * n_phi + phi_bin, -1)
+
     def get_polar_histogram(self, qs, phis):
         r"""
         Calculate a histogram in polar coordinates, using the bin edges defined by ``q_edges`` and ``phi_edges`` during initialization.
@@ -323,31 +354,18 @@ class Dartboard:
 
         Returns: (numpy array) 2D boolean mask in packed format.
         """
-        mask = np.zeros_like(self.cartesian_qs, dtype="bool")
-
-        # uses about a Gb..., and this only 256x256
-        for cell_index in cell_index_list:
-
-            qi, pi = cell_index
-            q_min, q_max = self.q_edges[qi : qi + 2]
-            p0_min, p0_max = self.phi_edges[pi : pi + 2]
-            # also include Hermitian values
-            p1_min, p1_max = self.phi_edges[pi : pi + 2] - np.pi
-
-            # whether or not the q and phi values of the coordinate array
-            # fit in the q cell and *either of* the regular or Hermitian phi cell
-            ind = (
-                (self.cartesian_qs >= q_min)
-                & (self.cartesian_qs < q_max)
-                & (
-                    ((self.cartesian_phis > p0_min) & (self.cartesian_phis <= p0_max))
-                    | ((self.cartesian_phis > p1_min) & (self.cartesian_phis <= p1_max))
-                )
-            )
 
-            mask[ind] = True
+        indices = np.atleast_2d(np.asarray(cell_index_list))
+        if indices.size == 0:
+            return np.zeros_like(self.cartesian_qs, dtype="bool")
+
+        # convert the [q_cell, phi_cell] pairs to the flattened cell ids
+        # precomputed during initialization (the Hermitian phi cells share
+        # the same id) and test the grid against them in one pass
+        n_phi = len(self.phi_edges) - 1
+        ids = indices[:, 0] * n_phi + indices[:, 1]
 
-        return mask
+        return np.isin(self.cartesian_cell_ids, ids)
 
 
 class KFoldCrossValidatorGridded:
@@ -399,7 +417,7 @@ class KFoldCrossValidatorGridded:
 
         # 2D mask for any UV cells that contain visibilities
         # in *any* channel
-        stacked_mask = np.any(self.griddedDataset.mask.detach().numpy(), axis=0)
+        stacked_mask = np.any(self.griddedDataset.mask.detach().cpu().numpy(), axis=0)
 
         # get qs, phis from dataset and turn into 1D lists
         qs = self.griddedDataset.coords.packed_q_centers_2D[stacked_mask]
@@ -157,19 +157,25 @@ class Gridder:
             A 3D array of size ``(nchan, npix, npix)`` in ground format containing the summed cell quantities.
 
         """
-        # calculate the histogrammed result for all channels
-        cube = np.empty(
-            (self.nchan, self.coords.ncell_v, self.coords.ncell_u),
-            dtype="float",
+        # histogram all channels in a single vectorized call by treating the
+        # channel index as a third (integer-binned) histogram dimension,
+        # rather than looping channel-by-channel
+        channel = np.broadcast_to(np.arange(self.nchan)[:, np.newaxis], self.uu.shape)
+
+        sample = np.column_stack((channel.ravel(), self.vv.ravel(), self.uu.ravel()))
+
+        weights = None if values is None else np.asarray(values).ravel()
+
+        cube, edges = np.histogramdd(
+            sample,
+            bins=[
+                np.arange(self.nchan + 1),
+                self.coords.v_edges,
+                self.coords.u_edges,
+            ],
+            weights=weights,
         )
 
-        if values is None:
-            # pass None to every channel
-            values = [None] * self.nchan
-
-        for i in range(self.nchan):
-            cube[i] = self._sum_cell_values_channel(self.uu[i], self.vv[i], values[i])
-
         return cube
 
     def _extract_gridded_values_to_loose(self, gridded_quantity):
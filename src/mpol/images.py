@@ -2,7 +2,6 @@ r"""The ``images`` module provides the core functionality of MPoL via :class:`mp
 
 import numpy as np
 import torch
-import torch.fft  # to avoid conflicts with old torch.fft *function*
 from torch import nn
 
 from . import utils
@@ -27,6 +26,7 @@ class BaseCube(nn.Module):
         nchan (int): the number of channels in the base cube. Default = 1.
         pixel_mapping (torch.nn): a PyTorch function mapping the base pixel representation to the cube representation. If `None`, defaults to `torch.nn.Softplus() <https://pytorch.org/docs/stable/generated/torch.nn.Softplus.html#torch.nn.Softplus>`_. Output of the function should be in units of [:math:`\mathrm{Jy}\,\mathrm{arcsec}^{-2}`].
         base_cube (torch.double tensor, optional): a pre-packed base cube to initialize the model with. If None, assumes ``torch.zeros``.
+        dtype (torch.dtype): the datatype of the ``base_cube`` parameter. Defaults to ``torch.double``; ``torch.float32`` halves the memory traffic of the image-plane operations if the application tolerates single precision.
     """
 
     def __init__(
@@ -37,6 +37,7 @@ class BaseCube(nn.Module):
         nchan=None,
         pixel_mapping=None,
         base_cube=None,
+        dtype=torch.double,
     ):
 
         super().__init__()
@@ -49,7 +50,7 @@ class BaseCube(nn.Module):
                     (self.nchan, self.coords.npix, self.coords.npix),
                     fill_value=0.05,
                     requires_grad=True,
-                    dtype=torch.double,
+                    dtype=dtype,
                 )
             )
 
@@ -88,9 +89,10 @@ class HannConvCube(nn.Module):
     Args:
         nchan
         requires_grad (bool): keep kernel fixed
+        dtype (torch.dtype): the datatype of the (fixed) convolution kernel. Should match the datatype of the cube fed through ``forward``. Defaults to ``torch.double``.
     """
 
-    def __init__(self, nchan, requires_grad=False):
+    def __init__(self, nchan, requires_grad=False, dtype=torch.double):
 
         super().__init__()
         # simple convolutional filter operates on per-channel basis
@@ -108,7 +110,7 @@ class HannConvCube(nn.Module):
         # bias has shape (nchan)
 
         # build out the Hann kernel
-        spec = torch.tensor([0.25, 0.5, 0.25], dtype=torch.double)
+        spec = torch.tensor([0.25, 0.5, 0.25], dtype=dtype)
         nugget = torch.outer(spec, spec)  # shape (3,3) 2D Hann kernel
         exp = torch.unsqueeze(torch.unsqueeze(nugget, 0), 0)  # shape (1, 1, 3, 3)
         weight = exp.repeat(nchan, 1, 1, 1)  # shape (nchan, 1, 3, 3)
@@ -120,7 +122,7 @@ class HannConvCube(nn.Module):
 
         # set the bias to zero
         self.m.bias = nn.Parameter(
-            torch.zeros(nchan, dtype=torch.double), requires_grad=requires_grad
+            torch.zeros(nchan, dtype=dtype), requires_grad=requires_grad
         )
 
     def forward(self, cube):
@@ -162,6 +164,7 @@ class ImageCube(nn.Module):
         nchan (int): the number of channels in the image
         passthrough (bool): if passthrough, assume ImageCube is just a layer as opposed to parameter base.
         cube (torch.double tensor, of shape ``(nchan, npix, npix)``): (optional) a prepacked image cube to initialize the model with in units of [:math:`\mathrm{Jy}\,\mathrm{arcsec}^{-2}`]. If None, assumes starting ``cube`` is ``torch.zeros``.
+        dtype (torch.dtype): the datatype of the ``cube`` parameter (ignored if ``passthrough``). Defaults to ``torch.double``.
     """
 
     def __init__(
@@ -172,6 +175,7 @@ class ImageCube(nn.Module):
         nchan=None,
         passthrough=False,
         cube=None,
+        dtype=torch.double,
     ):
         super().__init__()
         _setup_coords(self, cell_size, npix, coords, nchan)
@@ -185,7 +189,7 @@ class ImageCube(nn.Module):
                         (self.nchan, self.coords.npix, self.coords.npix),
                         fill_value=0.0,
                         requires_grad=True,
-                        dtype=torch.double,
+                        dtype=dtype,
                     )
                 )
 
@@ -310,6 +314,21 @@ class FourierCube(nn.Module):
 
             self.coords = GridCoords(cell_size=cell_size, npix=npix)
 
+        # the cell_size prefactor (in arcsec) is to obtain the correct output units
+        # since it needs to correct for the spacing of the input grid.
+        # See MPoL documentation and/or TMS Eqn A8.18 for more information.
+        # pre-square it here so forward() doesn't redo it every iteration
+        self.prefactor = self.coords.cell_size ** 2
+
+        # run one throwaway transform at the fixed (npix, npix) size so the
+        # backend (MKL/pocketfft) plans and caches it now, rather than on the
+        # first training iteration. npix is constant across iterations, so
+        # every subsequent fft2 reuses this plan. Plan caches are keyed by
+        # precision, so match the torch.double cubes fed through forward.
+        torch.fft.fft2(
+            torch.zeros((1, self.coords.npix, self.coords.npix), dtype=torch.double)
+        )
+
     def forward(self, cube):
         """
         Perform the FFT of the image cube for each channel.
@@ -324,10 +343,8 @@ class FourierCube(nn.Module):
         # make sure the cube is 3D
         assert cube.dim() == 3, "cube must be 3D"
 
-        # the self.cell_size prefactor (in arcsec) is to obtain the correct output units
-        # since it needs to correct for the spacing of the input grid.
-        # See MPoL documentation and/or TMS Eqn A8.18 for more information.
-        self.vis = self.coords.cell_size ** 2 * torch.fft.fftn(cube, dim=(1, 2))
+        # fft2 batches the transform over the leading (channel) dimension
+        self.vis = self.prefactor * torch.fft.fft2(cube)
 
         return self.vis
 
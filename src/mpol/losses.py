@@ -202,8 +202,8 @@ def UV_sparsity(vis, qs, q_max):
     Enforce a sparsity prior for all :math:`q = \sqrt{u^2 + v^2}` points larger than :math:`q_\mathrm{max}`.
 
     Args:
-        vis (torch.double) : visibility cube of (nchan, npix, npix//2 +1, 2)
-        qs: numpy array corresponding to visibility coordinates. Dimensionality of (npix, npix//2)
+        vis (torch.complex) : visibility cube of (nchan, npix, npix)
+        qs: numpy array corresponding to visibility coordinates. Dimensionality of (npix, npix)
         q_max (float): maximum radial baseline
 
     Returns:
@@ -211,16 +211,15 @@ def UV_sparsity(vis, qs, q_max):
     """
 
     # make a mask, then send it to the device (in case we're using a GPU)
-    mask = torch.tensor((qs > q_max), dtype=torch.bool).to(vis.device)
-
-    vis_re = vis[:, :, :, 0]
-    vis_im = vis[:, :, :, 1]
+    mask = torch.tensor((qs > q_max), dtype=torch.bool, device=vis.device)
 
     # broadcast mask to the same shape as vis
     mask = mask.unsqueeze(0)
 
-    loss = torch.sum(torch.abs(vis_re.masked_select(mask))) + torch.sum(
-        torch.abs(vis_im.masked_select(mask))
+    # masked_select with gradients does not yet work on the complex vis
+    # directly, so select the reals and imaginaries separately
+    loss = torch.sum(torch.abs(vis.real.masked_select(mask))) + torch.sum(
+        torch.abs(vis.imag.masked_select(mask))
     )
 
     return loss
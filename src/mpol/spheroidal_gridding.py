@@ -4,7 +4,8 @@ You probably wont need to use these routines in the normal workflow of MPoL, but
 """
 
 import numpy as np
-from scipy.sparse import lil_matrix
+import torch
+from scipy.sparse import block_diag, coo_matrix, hstack
 
 from . import utils
 from .constants import arcsec
@@ -113,27 +114,30 @@ def corrfun_mat(alphas, deltas):
     ny = len(deltas)
     nx = len(alphas)
 
-    mat = np.empty((ny, nx), dtype="float")
-
     # The size of one half-of the image.
     # sometimes ra and dec will be symmetric about 0, othertimes they won't
     # so this is a more robust way to determine image half-size
     maxra = np.abs(alphas[2] - alphas[1]) * nx / 2
     maxdec = np.abs(deltas[2] - deltas[1]) * ny / 2
 
-    for i in range(nx):
-        for j in range(ny):
-            etax = (alphas[i]) / maxra
-            etay = (deltas[j]) / maxdec
+    etax = alphas / maxra
+    etay = deltas / maxdec
+
+    # points with |eta| > 1.0 would be querying outside the shifted image
+    # bounds, so set their correction to 0.0
+    ind_x = np.abs(etax) <= 1.0
+    ind_y = np.abs(etay) <= 1.0
 
-            if (np.abs(etax) > 1.0) or (np.abs(etay) > 1.0):
-                # We would be querying outside the shifted image
-                # bounds, so set this emission to 0.0
-                mat[j, i] = 0.0
-            else:
-                mat[j, i] = 1 / (corrfun(etax) * corrfun(etay))
+    corr_x = np.zeros(nx)
+    corr_x[ind_x] = 1 / corrfun(etax[ind_x])
 
-    return mat
+    corr_y = np.zeros(ny)
+    corr_y[ind_y] = 1 / corrfun(etay[ind_y])
+
+    # the 2D correction is separable, so rather than evaluating the
+    # spheroid at all (ny, nx) points, evaluate the two 1D corrections and
+    # take their outer product. Out-of-bounds zeros propagate through.
+    return np.outer(corr_y, corr_x)
 
 
 def gcffun(eta):
@@ -177,7 +181,7 @@ def calc_matrices(u_data, v_data, u_model, v_model):
         v_model: the :math:`v` axis delivered by the rfft (unflattened, in [:math:`k\lambda`]). Assuming this is leading dimension, which is the one over which the FFT was carried out.
 
     Returns:
-        2-tuple : `coo` format sparse matrices :math:`C_\Re` and :math:`C_\Im`
+        2-tuple : `csr` format sparse matrices :math:`C_\Re` and :math:`C_\Im`. CSR supports a contiguous row traversal during the sparse matrix multiply, which is considerably faster (and more cache-friendly) than the scatter-add required by COO formats.
 
     Begin with an image packed like ``Img[j, i]``, where ``i`` is the :math:`l` index and ``j`` is the :math:`m` index.
     Then the RFFT output will look like ``RFFT[j, i]``, where ``i`` is the u index and ``j`` is the v index.
@@ -195,7 +199,9 @@ def calc_matrices(u_data, v_data, u_model, v_model):
     vstride = len(u_model)
     Npix = len(v_model)
 
-    data_points = np.array([u_data, v_data]).T
+    u_data = np.asarray(u_data)
+    v_data = np.asarray(v_data)
+
     # assert that the maximum baseline is contained within the model grid, which is the same as saying
     # that the image-plane pixels are small enough.
     assert (
@@ -206,122 +212,161 @@ def calc_matrices(u_data, v_data, u_model, v_model):
     )  # choose -4, because we'll need 3 pixels to do the interpolation
 
     # number of visibility points in the dataset
-    N_vis = len(data_points)
-
-    # initialize two sparse lil matrices for the instantiation
-    # convert to csc at the end
-    C_real = lil_matrix((N_vis, (Npix * vstride)), dtype="float")
-    C_imag = lil_matrix((N_vis, (Npix * vstride)), dtype="float")
+    N_vis = len(u_data)
 
     # determine model grid spacing
     du = np.abs(u_model[1] - u_model[0])
     dv = np.abs(v_model[1] - v_model[0])
 
-    # for each data_point within the grid, calculate the row and insert it into the matrix
-    for row_index, (u, v) in enumerate(data_points):
+    # calculate the kernel footprint for all data points at once, working on
+    # contiguous (N_vis, ...) arrays instead of looping point-by-point
 
-        # assuming the grid stretched for -/+ values easily
-        i0 = int(np.ceil(u / du))
-        j0 = int(np.ceil(v / dv))
+    # nearest grid indices, assuming the grid stretched for -/+ values easily
+    i0 = np.ceil(u_data / du).astype(int)
+    j0 = np.ceil(v_data / dv).astype(int)
 
-        i_indices = np.arange(i0 - 3, i0 + 3)
-        j_indices = np.arange(j0 - 3, j0 + 3)
+    offsets = np.arange(-3, 3)
+    i_indices = i0[:, np.newaxis] + offsets  # (N_vis, 6)
+    j_indices = j0[:, np.newaxis] + offsets  # (N_vis, 6)
 
-        # calculate the etas and weights
-        u_etas = (u / du - i_indices) / 3
-        v_etas = (v / dv - j_indices) / 3
+    # calculate the etas and weights
+    u_etas = (u_data[:, np.newaxis] / du - i_indices) / 3
+    v_etas = (v_data[:, np.newaxis] / dv - j_indices) / 3
 
-        uw = gcffun(u_etas)
-        vw = gcffun(v_etas)
+    uw = gcffun(u_etas)  # (N_vis, 6)
+    vw = gcffun(v_etas)  # (N_vis, 6)
 
-        w = np.sum(uw) * np.sum(vw)
+    w = np.sum(uw, axis=1) * np.sum(vw, axis=1)  # (N_vis,)
 
-        l_indices = np.zeros(36, dtype="int")
-        weights_real = np.zeros(36, dtype="float")
-        weights_imag = np.zeros(36, dtype="float")
+    # expand to all 36 kernel points per visibility, ordered so that the
+    # u indices change the quickest
+    i_index = np.tile(i_indices, (1, 6))  # (N_vis, 36)
+    j_index = np.repeat(j_indices, 6, axis=1)  # (N_vis, 36)
 
-        # loop through all 36 points and calculate the matrix element
-        # do it in this order because u indices change the quickest
-        for j in range(6):
-            for i in range(6):
-                k = j * 6 + i
+    weights_real = (vw[:, :, np.newaxis] * uw[:, np.newaxis, :]).reshape(N_vis, 36) / w[
+        :, np.newaxis
+    ]
 
-                i_index = i_indices[i]
+    # map negative i indices to their positive Hermitian conjugate cells:
+    # flip the sign of both indices and conjugate the imaginary weight
+    ind_neg = i_index < 0
+    i_index = np.where(ind_neg, -i_index, i_index)
+    j_index = np.where(ind_neg, -j_index, j_index)
+    weights_imag = np.where(ind_neg, -weights_real, weights_real)
 
-                if i_index >= 0:
-                    j_index = j_indices[j]
-                    imag_prefactor = 1.0
+    # shrink j to fit in the range of [0, Npix]
+    j_index = np.where(j_index < 0, j_index + Npix, j_index)
 
-                else:  # i_index < 0:
-                    # map negative i index to positive i_index
-                    i_index = -i_index
+    l_indices = i_index + j_index * vstride
 
-                    # map j index to opposite sign
-                    j_index = -j_indices[j]
+    # assemble the matrices directly in COO form; kernel points that land on
+    # the same RFFT cell (duplicate row/col pairs) are summed during the
+    # conversion to CSR, which consolidates the conjugate overlaps
+    rows = np.repeat(np.arange(N_vis), 36)
+    cols = l_indices.ravel()
+    C_shape = (N_vis, Npix * vstride)
 
-                    # take the complex conjugate for the imaginary weight
-                    imag_prefactor = -1.0
+    C_real = coo_matrix((weights_real.ravel(), (rows, cols)), shape=C_shape)
+    C_imag = coo_matrix((weights_imag.ravel(), (rows, cols)), shape=C_shape)
 
-                # shrink j to fit in the range of [0, Npix]
-                if j_index < 0:
-                    j_index += Npix
+    return C_real.tocsr(), C_imag.tocsr()
 
-                l_indices[k] = i_index + j_index * vstride
-                weights_real[k] = uw[i] * vw[j] / w
-                weights_imag[k] = imag_prefactor * uw[i] * vw[j] / w
 
-        # TODO: at the end, decide whether there is overlap and consolidate
-        l_sorted, unique_indices, unique_inverse, unique_counts = np.unique(
-            l_indices, return_index=True, return_inverse=True, return_counts=True
-        )
-        if len(unique_indices) < 36:
-            # Some indices are querying the same point in the RFFT grid, and their weights need to be
-            # consolidated
+def calc_matrix(u_data, v_data, u_model, v_model):
+    r"""
+    Calculate a single fused sparse interpolation matrix :math:`C` for RFFT output, using spheroidal wave functions.
+
+    :func:`~mpol.spheroidal_gridding.calc_matrices` delivers two real sparse matrices, which are applied as two separate sparse matrix multiplies
+
+    .. math::
+
+        V_\Re = C_\Re W_\Re \quad \mathrm{and} \quad V_\Im = C_\Im W_\Im.
+
+    Because the two matrices share the same non-zero pattern (the same gridding kernel footprint around each :math:`(u,v)` sample), they can be fused into one complex-valued matrix by horizontal concatenation
+
+    .. math::
 
-            N_unique = len(l_sorted)
-            condensed_weights_real = np.zeros(N_unique)
-            condensed_weights_imag = np.zeros(N_unique)
+        C = \left[ C_\Re, \; i\, C_\Im \right]
 
-            # find where unique_counts > 1
-            ind_multiple = unique_counts > 1
+    such that a *single* sparse matrix multiply against the stacked real vector :math:`W = [W_\Re; W_\Im]` delivers the complex visibilities directly
 
-            # take the single weights from the array
-            ind_single = ~ind_multiple
+    .. math::
+
+        V = C W = C_\Re W_\Re + i\, C_\Im W_\Im.
+
+    This halves the number of sparse matrix products (and index gathers) per model evaluation relative to the two-matrix form. Note that a naive complex matrix :math:`C_\Re + i C_\Im` applied to the complex :math:`W` would *not* be equivalent, since the real and imaginary outputs each sample only the like component of the RFFT.
+
+    Args:
+
+        u_data (1D numpy array): the :math:`u` coordinates of the dataset (in [:math:`k\lambda`])
+        v_data (1D numpy array): the :math:`v` coordinates of the dataset (in [:math:`k\lambda`])
+        u_model: the :math:`u` axis delivered by the rfft (unflattened, in [:math:`k\lambda`]). Assuming this is trailing dimension, which is the one over which the RFFT was carried out.
+        v_model: the :math:`v` axis delivered by the rfft (unflattened, in [:math:`k\lambda`]). Assuming this is leading dimension, which is the one over which the FFT was carried out.
 
-            # these are the indices back to the original weights of sorted singles
-            # unique_indices[ind_single]
+    Returns:
+        `csr` format complex sparse matrix :math:`C` of shape ``(N_vis, 2 * Npix * (Npix//2 + 1))``, designed to multiply the concatenation of the flattened real and imaginary RFFT outputs.
+    """
+
+    C_real, C_imag = calc_matrices(u_data, v_data, u_model, v_model)
 
-            # get the weights of the values that only occur once
-            condensed_weights_real[ind_single] = weights_real[
-                unique_indices[ind_single]
-            ]
-            condensed_weights_imag[ind_single] = weights_imag[
-                unique_indices[ind_single]
-            ]
+    return hstack([C_real, 1.0j * C_imag]).tocsr()
 
-            # the indices that occur multiple times
-            # l_sorted[ind_multiple]
 
-            # the indices of indices that occur multiple times
-            ind_arg = np.where(ind_multiple)[0]
+def calc_matrix_block(u_data, v_data, u_model, v_model):
+    r"""
+    Calculate a single fused *real-valued* block-diagonal sparse interpolation matrix for RFFT output, using spheroidal wave functions.
 
-            for repeated_index in ind_arg:
-                # figure out the indices of the repeated indices in the original flattened index array
-                repeats = np.where(l_sorted[repeated_index] == l_indices)
+    This is an alternative to :func:`~mpol.spheroidal_gridding.calc_matrix` for backends without complex sparse matrix support. The two matrices from :func:`~mpol.spheroidal_gridding.calc_matrices` are placed on the diagonal of one real matrix
 
-                # stuff the sum of these weights into the condensed array
-                condensed_weights_real[repeated_index] = np.sum(weights_real[repeats])
-                condensed_weights_imag[repeated_index] = np.sum(weights_imag[repeats])
+    .. math::
+
+        C = \begin{bmatrix} C_\Re & 0 \\ 0 & C_\Im \end{bmatrix}
+
+    such that a *single* sparse matrix multiply against the stacked real vector :math:`W = [W_\Re; W_\Im]` delivers the stacked visibilities
+
+    .. math::
+
+        C W = [V_\Re; V_\Im],
+
+    which are split back into real and imaginary halves afterwards. Like the complex fused form, this halves the number of sparse matrix products per model evaluation, but stays entirely in real arithmetic.
+
+    Args:
+
+        u_data (1D numpy array): the :math:`u` coordinates of the dataset (in [:math:`k\lambda`])
+        v_data (1D numpy array): the :math:`v` coordinates of the dataset (in [:math:`k\lambda`])
+        u_model: the :math:`u` axis delivered by the rfft (unflattened, in [:math:`k\lambda`]). Assuming this is trailing dimension, which is the one over which the RFFT was carried out.
+        v_model: the :math:`v` axis delivered by the rfft (unflattened, in [:math:`k\lambda`]). Assuming this is leading dimension, which is the one over which the FFT was carried out.
+
+    Returns:
+        `csr` format real sparse matrix :math:`C` of shape ``(2 * N_vis, 2 * Npix * (Npix//2 + 1))``, designed to multiply the concatenation of the flattened real and imaginary RFFT outputs. Rows ``[0, N_vis)`` of the product are the real visibilities and rows ``[N_vis, 2 * N_vis)`` are the imaginary visibilities.
+    """
+
+    C_real, C_imag = calc_matrices(u_data, v_data, u_model, v_model)
+
+    return block_diag((C_real, C_imag)).tocsr()
+
+
+def matrix_to_torch(C, device=None):
+    r"""
+    Convert a scipy sparse interpolation matrix (e.g., from :func:`~mpol.spheroidal_gridding.calc_matrices` or :func:`~mpol.spheroidal_gridding.calc_matrix`) into a coalesced PyTorch sparse tensor, suitable for use with ``torch.sparse.mm``.
+
+    Args:
+        C: a scipy sparse matrix
+        device (torch.device): the desired device of the tensor. If ``None``, defaults to the current device.
+
+    Returns:
+        a coalesced ``torch.sparse_coo_tensor`` with the same shape, values, and dtype as ``C``
+    """
 
-            # remap these variables to the shortened arrays
-            l_indices = l_sorted
-            weights_real = condensed_weights_real
-            weights_imag = condensed_weights_imag
+    C = C.tocoo()
 
-        C_real[row_index, l_indices] = weights_real
-        C_imag[row_index, l_indices] = weights_imag
+    # stack row/col into a single contiguous (2, nnz) array and hand it to
+    # torch zero-copy, rather than going through the (much slower)
+    # list-of-arrays tensor constructor
+    indices = torch.from_numpy(np.vstack((C.row, C.col)).astype(np.int64))
+    values = torch.from_numpy(C.data)
 
-    return C_real.tocoo(), C_imag.tocoo()
+    return torch.sparse_coo_tensor(indices, values, C.shape, device=device).coalesce()
 
 
 def grid_datachannel(uu, vv, weights, re, im, cell_size, npix, debug=False, **kwargs):
@@ -12,9 +12,9 @@ def ground_cube_to_packed_cube(ground_cube):
         ground_cube: a previously initialized Ground Cube object (cube (3D torch tensor of shape ``(nchan, npix, npix)``))
 
     Returns:
-        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the input arg; i.e Returns a Packed Visibility Cube. 
+        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the input arg; i.e Returns a Packed Visibility Cube. The shift operates on the trailing two dimensions, so a single 2D image is also accepted.
     """
-    shifted = torch.fft.fftshift(ground_cube, dim=(1, 2))
+    shifted = torch.fft.fftshift(ground_cube, dim=(-2, -1))
     return shifted
 
 
@@ -26,10 +26,10 @@ def packed_cube_to_ground_cube(packed_cube):
         packed_cube: a previously initialized Packed Cube object (cube (3D torch tensor of shape ``(nchan, npix, npix)``))
 
     Returns:
-        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the input arg; i.e Returns a Ground Cube.
+        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the input arg; i.e Returns a Ground Cube. The shift operates on the trailing two dimensions, so a single 2D image is also accepted.
     """
     # fftshift the image cube to the correct quadrants
-    shifted = torch.fft.fftshift(packed_cube, dim=(1, 2))
+    shifted = torch.fft.fftshift(packed_cube, dim=(-2, -1))
     return shifted
 
 
@@ -41,10 +41,10 @@ def sky_cube_to_packed_cube(sky_cube):
         sky_cube: a previously initialized Sky Cube object with RA increasing to the *left* (cube (3D torch tensor of shape ``(nchan, npix, npix)``))
 
     Returns:
-        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the ``torch.flip()`` of the RA axis; i.e Returns a Packed Image Cube.
+        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the ``torch.flip()`` of the RA axis; i.e Returns a Packed Image Cube. The shift operates on the trailing two dimensions, so a single 2D image is also accepted.
     """
-    flipped = torch.flip(sky_cube, (2,))
-    shifted = torch.fft.fftshift(flipped, dim=(1, 2))
+    flipped = torch.flip(sky_cube, (-1,))
+    shifted = torch.fft.fftshift(flipped, dim=(-2, -1))
     return shifted
 
 
@@ -56,12 +56,12 @@ def packed_cube_to_sky_cube(packed_cube):
         packed_cube: a previously initialized Packed Image Cube object (cube (3D torch tensor of shape ``(nchan, npix, npix)``))
 
     Returns:
-        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the ``torch.flip()`` of the RA axis; i.e Returns a Sky Cube.
+        torch.double : 3D image cube of shape ``(nchan, npix, npix)``; The resulting array after applying ``torch.fft.fftshift`` to the ``torch.flip()`` of the RA axis; i.e Returns a Sky Cube. The shift operates on the trailing two dimensions, so a single 2D image is also accepted.
     """
     # fftshift the image cube to the correct quadrants
-    shifted = torch.fft.fftshift(packed_cube, dim=(1, 2))
+    shifted = torch.fft.fftshift(packed_cube, dim=(-2, -1))
     # flip so that east points left
-    flipped = torch.flip(shifted, (2,))
+    flipped = torch.flip(shifted, (-1,))
     return flipped
 
 
@@ -3,7 +3,7 @@ import pytest
 import torch
 
 from astropy.io import fits
-from mpol import gridding, images, utils
+from mpol import gridding, images, precomposed, utils
 from mpol.constants import *
 
 
@@ -271,3 +271,16 @@ def test_multi_chan_conv(coords, tmp_path):
     conv_layer = images.HannConvCube(nchan=nchan)
 
     conv_layer(test_cube)
+
+
+def test_single_precision_forward(coords):
+    # check that a float32 model feeds forward through the conv and FFT
+    # chain without promotion mismatches
+    nchan = 2
+    rml = precomposed.SimpleNet(coords=coords, nchan=nchan, dtype=torch.float32)
+
+    vis = rml.forward()
+
+    assert rml.bcube.base_cube.dtype == torch.float32
+    assert rml.icube.cube.dtype == torch.float32
+    assert vis.dtype == torch.complex64
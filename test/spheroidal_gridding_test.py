@@ -351,6 +351,13 @@ def test_plot_interpolation_matrices(tmp_path, interpolation_matrices):
     fig.savefig(tmp_path / "C_imag.png", dpi=300)
 
 
+def test_matrix_to_torch_roundtrip(interpolation_matrices):
+    # the torch sparse tensors should reproduce the scipy matrices exactly
+    for C in interpolation_matrices:
+        C_torch = spheroidal_gridding.matrix_to_torch(C)
+        assert np.allclose(C_torch.to_dense().numpy(), C.toarray())
+
+
 @pytest.fixture(scope="module")
 def interpolated_prolate(vis_dict, interpolation_matrices):
     vis = vis_dict["vis"]
@@ -371,6 +378,32 @@ def test_interpolate_points_prolate(analytic_samples, interpolated_prolate, vis_
     assert np.all(np.abs(np.abs(analytic_samples - interp) / vis_range) < 1e-3)
 
 
+def test_fused_matrices_consistent(vis_dict, baselines, interpolated_prolate):
+    # the fused complex and block-diagonal matrices should reproduce the
+    # two-matrix interpolation exactly
+    u_data = baselines[:, 0]
+    v_data = baselines[:, 1]
+    us = vis_dict["us"]
+    vs = vis_dict["vs"]
+    vis = vis_dict["vis"]
+
+    interp_real, interp_imag = interpolated_prolate
+    N_vis = len(u_data)
+
+    # stacked [W_real; W_imag] right-hand side
+    W = np.concatenate([np.real(vis.flatten()), np.imag(vis.flatten())])
+
+    C = spheroidal_gridding.calc_matrix(u_data, v_data, us, vs)
+    interp = C.dot(W)
+    assert np.allclose(np.real(interp), interp_real)
+    assert np.allclose(np.imag(interp), interp_imag)
+
+    C_block = spheroidal_gridding.calc_matrix_block(u_data, v_data, us, vs)
+    stacked = C_block.dot(W)
+    assert np.allclose(stacked[:N_vis], interp_real)
+    assert np.allclose(stacked[N_vis:], interp_imag)
+
+
 def test_plot_points_prolate(
     tmp_path, analytic_samples, interpolated_prolate, vis_dict
 ):